@@ -3,7 +3,10 @@ Module to run the worker.
 """
 # @@@SNIPSTART saga-py-worker-import
 import asyncio
+import multiprocessing
+import os
 
+import uvloop
 from temporalio.client import Client
 from temporalio.worker import Worker
 
@@ -20,7 +23,20 @@ from workflows import BookingWorkflow
 
 # @@@SNIPEND
 # @@@SNIPSTART saga-py-worker-loop
-interrupt_event = asyncio.Event()
+WORKER_PROCESSES = int(os.environ.get("SAGA_WORKER_PROCESSES", os.cpu_count() or 1))
+MAX_CONCURRENT_ACTIVITIES = int(os.environ.get("SAGA_MAX_CONCURRENT_ACTIVITIES", 200))
+MAX_CONCURRENT_LOCAL_ACTIVITIES = int(
+    os.environ.get("SAGA_MAX_CONCURRENT_LOCAL_ACTIVITIES", 200)
+)
+MAX_CONCURRENT_WORKFLOW_TASKS = int(
+    os.environ.get("SAGA_MAX_CONCURRENT_WORKFLOW_TASKS", 100)
+)
+MAX_CONCURRENT_ACTIVITY_TASK_POLLS = int(
+    os.environ.get("SAGA_MAX_CONCURRENT_ACTIVITY_TASK_POLLS", 10)
+)
+MAX_CONCURRENT_WORKFLOW_TASK_POLLS = int(
+    os.environ.get("SAGA_MAX_CONCURRENT_WORKFLOW_TASK_POLLS", 10)
+)
 
 
 async def main():
@@ -41,21 +57,43 @@ async def main():
             undo_book_hotel,
             undo_book_flight,
         ],
+        max_concurrent_activities=MAX_CONCURRENT_ACTIVITIES,
+        max_concurrent_local_activities=MAX_CONCURRENT_LOCAL_ACTIVITIES,
+        max_concurrent_workflow_tasks=MAX_CONCURRENT_WORKFLOW_TASKS,
+        max_concurrent_activity_task_polls=MAX_CONCURRENT_ACTIVITY_TASK_POLLS,
+        max_concurrent_workflow_task_polls=MAX_CONCURRENT_WORKFLOW_TASK_POLLS,
     )
     print("\nWorker started, ctrl+c to exit\n")
-    await worker.run()
     try:
-        await interrupt_event.wait()
+        async with worker:
+            # The worker polls in the background until this task is cancelled
+            await asyncio.Future()
     finally:
         print("\nShutting down the worker\n")
 
 
-if __name__ == "__main__":
-    loop = asyncio.get_event_loop()
+def run_worker_process():
+    """
+    Runs one worker on its own event loop and Temporal client.
+    """
     try:
-        loop.run_until_complete(main())
+        uvloop.run(main())
     except KeyboardInterrupt:
         print("\nInterrupt received, shutting down...\n")
-        interrupt_event.set()
-        loop.run_until_complete(loop.shutdown_asyncgens())
+
+
+if __name__ == "__main__":
+    processes = [
+        multiprocessing.Process(target=run_worker_process)
+        for _ in range(WORKER_PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # ctrl+c reaches every worker process; wait for them to shut down
+        for process in processes:
+            process.join()
 # @@@SNIPEND
@@ -2,10 +2,12 @@
 Module for shared data structures and constants.
 """
 # @@@SNIPSTART saga-py-shared
+import sys
 from dataclasses import dataclass
+from typing import Final
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BookVacationInput:
     attempts: int
     book_user_id: str
@@ -14,5 +16,5 @@ class BookVacationInput:
     book_flight_id: str
 
 
-TASK_QUEUE_NAME = "saga-task-queue"
+TASK_QUEUE_NAME: Final[str] = sys.intern("saga-task-queue")
 # @@@SNIPEND
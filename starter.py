@@ -3,10 +3,15 @@ Module to run the workflow.
 """
 # @@@SNIPSTART saga-py-starter-import
 import asyncio
+import functools
 import uuid
 
-from flask import Flask, jsonify, request
-from temporalio.client import Client
+import orjson
+from cachetools import TTLCache
+from quart import Quart, current_app, jsonify, request
+from quart.json.provider import DefaultJSONProvider
+from temporalio.client import Client, WorkflowExecutionStatus
+from temporalio.service import RPCError, RPCStatusCode
 
 from shared import TASK_QUEUE_NAME, BookVacationInput
 from workflows import BookingWorkflow
@@ -14,11 +19,78 @@ from workflows import BookingWorkflow
 
 # @@@SNIPEND
 # @@@SNIPSTART saga-py-starter-initialize
-def create_app(temporal_client: Client):
-    app = Flask(__name__)
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that parses requests and serializes responses with orjson.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def create_app():
+    app = Quart(__name__)
+    app.json = OrjsonProvider(app)
+    recent_bookings = TTLCache(maxsize=10_000, ttl=60)
+
+    @app.before_serving
+    async def connect_temporal_client():
+        """
+        Connects the Temporal client once, before the first request is served.
+        """
+        app.extensions["temporal_client"] = await Client.connect("localhost:7233")
+
+    @app.after_serving
+    async def release_temporal_client():
+        """
+        Drops the shared Temporal client when the server shuts down.
+        """
+        app.extensions.pop("temporal_client", None)
 
     def generate_unique_username(name):
-        return f'{name.replace(" ", "-").lower()}-{str(uuid.uuid4().int)[:6]}'
+        return f'{name.replace(" ", "-").lower()}-{uuid.uuid4().hex[:6]}'
+
+    async def start_booking(client, input_data):
+        """
+        Starts the booking workflow without waiting for it to finish.
+
+        Args:
+            client (Client): Shared Temporal client.
+            input_data (BookVacationInput): Input data for the workflow.
+
+        Returns:
+            dict: User id, workflow id and pending status of the booking.
+        """
+        handle = await client.start_workflow(
+            BookingWorkflow.run,
+            input_data,
+            id=input_data.book_user_id,
+            task_queue=TASK_QUEUE_NAME,
+        )
+        return {
+            "user_id": input_data.book_user_id,
+            "workflow_id": handle.id,
+            "status": "pending",
+        }
+
+    def evict_failed_booking(key, booking):
+        """
+        Drops a cached booking start that failed, so it can be retried.
+
+        Runs as a done callback, so the failure is retrieved and evicted even
+        when every request awaiting it has been cancelled.
+
+        Args:
+            key (tuple): Cache key of the booking.
+            booking (asyncio.Future): Finished booking start.
+        """
+        if booking.cancelled() or booking.exception() is not None:
+            if recent_bookings.get(key) is booking:
+                del recent_bookings[key]
 
     # @@@SNIPEND
     # @@@SNIPSTART saga-py-starter-post
@@ -30,42 +102,127 @@ def create_app(temporal_client: Client):
         Returns:
             Response: JSON response with booking details or error message.
         """
-        user_id = generate_unique_username(request.json.get("name"))
-        attempts = request.json.get("attempts")
-        car = request.json.get("car")
-        hotel = request.json.get("hotel")
-        flight = request.json.get("flight")
-
-        input_data = BookVacationInput(
-            attempts=int(attempts),
-            book_user_id=user_id,
-            book_car_id=car,
-            book_hotel_id=hotel,
-            book_flight_id=flight,
-        )
+        data = await request.get_json(cache=True)
+        attempts = int(data["attempts"])
+        car = data["car"]
+        hotel = data["hotel"]
+        flight = data["flight"]
+
+        # Identical submissions within the TTL share one workflow; the
+        # randomized username is derived from the name, so key on the name
+        key = (data["name"], attempts, car, hotel, flight)
+        booking = recent_bookings.get(key)
+        if booking is None:
+            input_data = BookVacationInput(
+                attempts=attempts,
+                book_user_id=generate_unique_username(data["name"]),
+                book_car_id=car,
+                book_hotel_id=hotel,
+                book_flight_id=flight,
+            )
+            client = current_app.extensions["temporal_client"]
+            booking = asyncio.ensure_future(start_booking(client, input_data))
+            booking.add_done_callback(functools.partial(evict_failed_booking, key))
+            recent_bookings[key] = booking
+
+        # Shielded so a dropped connection does not cancel a shared start
+        response = await asyncio.shield(booking)
+
+        return jsonify(response), 202
+
+    @app.route("/book_batch", methods=["POST"])
+    async def book_vacation_batch():
+        """
+        Endpoint to book several vacations with a single request.
 
-        result = await temporal_client.execute_workflow(
-            BookingWorkflow.run,
-            input_data,
-            id=user_id,
-            task_queue=TASK_QUEUE_NAME,
+        Returns:
+            Response: JSON list with the user id and workflow id of each booking,
+                or its error if the workflow could not be started; 400 if the
+                body is not a list of valid bookings.
+        """
+        data = await request.get_json(cache=True)
+        if not isinstance(data, list):
+            return jsonify({"error": "Expected a list of bookings"}), 400
+
+        inputs = []
+        for index, booking in enumerate(data):
+            try:
+                inputs.append(
+                    BookVacationInput(
+                        attempts=int(booking["attempts"]),
+                        book_user_id=generate_unique_username(booking["name"]),
+                        book_car_id=booking["car"],
+                        book_hotel_id=booking["hotel"],
+                        book_flight_id=booking["flight"],
+                    )
+                )
+            except (AttributeError, KeyError, TypeError, ValueError):
+                return jsonify({"error": f"Invalid booking at index {index}"}), 400
+
+        client = current_app.extensions["temporal_client"]
+        # A failed start must not hide the bookings that did start
+        results = await asyncio.gather(
+            *(start_booking(client, input_data) for input_data in inputs),
+            return_exceptions=True,
         )
+        responses = [
+            {
+                "user_id": input_data.book_user_id,
+                "status": "error",
+                "error": str(result),
+            }
+            if isinstance(result, BaseException)
+            else result
+            for input_data, result in zip(inputs, results)
+        ]
+
+        return jsonify(responses), 202
+
+    @app.route("/book/<user_id>", methods=["GET"])
+    async def booking_status(user_id):
+        """
+        Endpoint to look up the outcome of a booking.
 
-        response = {"user_id": user_id, "result": result}
+        Args:
+            user_id (str): Unique username returned by the booking endpoint.
 
-        if result == "Voyage cancelled":
-            response["cancelled"] = True
+        Returns:
+            Response: JSON response with the booking result, a pending status
+                while the workflow is still running, or 404 for an unknown id.
+        """
+        client = current_app.extensions["temporal_client"]
+        handle = client.get_workflow_handle(user_id)
+
+        try:
+            description = await handle.describe()
+        except RPCError as ex:
+            if ex.status != RPCStatusCode.NOT_FOUND:
+                raise
+            return jsonify({"user_id": user_id, "error": "Booking not found"}), 404
+
+        if description.status == WorkflowExecutionStatus.RUNNING:
+            return jsonify({"user_id": user_id, "status": "pending"}), 202
+
+        # Terminated, cancelled, timed out or failed workflows have no result
+        if description.status != WorkflowExecutionStatus.COMPLETED:
+            response = {
+                "user_id": user_id,
+                "status": description.status.name.lower(),
+                "cancelled": True,
+            }
+            return jsonify(response)
+
+        result = await handle.result()
+        response = {"user_id": user_id, "cancelled": result["status"] != "success"}
+        response.update(result)
 
         return jsonify(response)
 
     return app
 
 
-async def main():
-    temporal_client = await Client.connect("localhost:7233")
-    app = create_app(temporal_client)
-    app.run(host="0.0.0.0", debug=True)
+app = create_app()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    app.run(host="0.0.0.0", port=3002, use_reloader=False)
@@ -2,10 +2,12 @@
 Module for defining saga workflows.
 """
 # @@@SNIPSTART saga-py-workflows-import
+import asyncio
 from datetime import timedelta
 
 from temporalio import workflow
 from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError
 
 with workflow.unsafe.imports_passed_through():
     from activities import (
@@ -18,6 +20,30 @@ with workflow.unsafe.imports_passed_through():
         undo_book_hotel,
     )
 
+_ACTIVITY_OPTIONS = {"start_to_close_timeout": timedelta(seconds=10)}
+_FLIGHT_OPTIONS = _ACTIVITY_OPTIONS | {
+    "retry_policy": RetryPolicy(
+        initial_interval=timedelta(seconds=1),
+        maximum_interval=timedelta(seconds=1),
+    ),
+}
+
+
+def _hotel_retry_policy(attempts: int) -> RetryPolicy:
+    """
+    Builds the hotel retry policy, the only one that depends on the input.
+
+    Args:
+        attempts (int): Maximum number of attempts for the hotel booking.
+
+    Returns:
+        RetryPolicy: Retry policy for the hotel booking.
+    """
+    return RetryPolicy(
+        maximum_attempts=attempts,
+        non_retryable_error_types=["ValueError"],
+    )
+
 
 # @@@SNIPEND
 # @@@SNIPSTART saga-py-workflows-run
@@ -36,53 +62,54 @@ class BookingWorkflow:
             book_input (BookVacationInput): Input data for the workflow.
 
         Returns:
-            str: Workflow result.
+            dict: Booked car, hotel and flight, or the failure error.
         """
-        compensations = []
-        results = {}
+        # The bookings are independent of each other, so they run concurrently
+        # and every step is registered for compensation up front.
+        compensations = [undo_book_car, undo_book_hotel, undo_book_flight]
+        hotel_options = _ACTIVITY_OPTIONS | {
+            "retry_policy": _hotel_retry_policy(book_input.attempts),
+        }
+        bookings = [
+            # Book car; a short, in-process call that needs no heartbeating or
+            # server-side retries, so it runs as a local activity without a
+            # round-trip through the task queue
+            workflow.start_local_activity(book_car, book_input, **_ACTIVITY_OPTIONS),
+            # Book hotel
+            workflow.start_activity(book_hotel, book_input, **hotel_options),
+            # Book flight; also short and retried locally with its own policy,
+            # so it runs as a local activity too
+            workflow.start_local_activity(book_flight, book_input, **_FLIGHT_OPTIONS),
+        ]
         try:
-            compensations.append(undo_book_car)
-            car_result = await workflow.execute_activity(
-                book_car,
-                book_input,
-                start_to_close_timeout=timedelta(seconds=10),
-            )
-            results["booked_car"] = car_result
+            car_result, hotel_result, flight_result = await asyncio.gather(*bookings)
 
-            # Book hotel
-            compensations.append(undo_book_hotel)
-            hotel_result = await workflow.execute_activity(
-                book_hotel,
-                book_input,
-                start_to_close_timeout=timedelta(seconds=10),
-                maximum_attempts=book_input.attempts,
-                retry_policy=RetryPolicy(non_retryable_error_types=["ValueError"]),
-            )
-            results["booked_hotel"] = hotel_result
-
-            # Book flight
-            compensations.append(undo_book_flight)
-            flight_result = await workflow.execute_activity(
-                book_flight,
-                book_input,
-                start_to_close_timeout=timedelta(seconds=10),
-                retry_policy=RetryPolicy(
-                    initial_interval=timedelta(seconds=1),
-                    maximum_interval=timedelta(seconds=1),
+            return {
+                "status": "success",
+                "car": car_result,
+                "hotel": hotel_result,
+                "flight": flight_result,
+            }
+
+        except ActivityError as ex:
+            # gather does not cancel the other bookings on the first failure,
+            # so stop them before rolling back
+            for booking in bookings:
+                booking.cancel()
+            await asyncio.gather(*bookings, return_exceptions=True)
+
+            # Undo steps are independent and run concurrently, in no guaranteed
+            # order; a failing one must not stop the rest
+            await asyncio.gather(
+                *(
+                    workflow.execute_activity(
+                        compensation, book_input, **_ACTIVITY_OPTIONS
+                    )
+                    for compensation in compensations
                 ),
+                return_exceptions=True,
             )
-            results["booked_flight"] = flight_result
-
-            return {"status": "success", "message": results}
-
-        except Exception as ex:
-            for compensation in reversed(compensations):
-                await workflow.execute_activity(
-                    compensation,
-                    book_input,
-                    start_to_close_timeout=timedelta(seconds=10),
-                )
-            return {"status": "failure", "message": str(ex)}
+            return {"status": "failure", "error": str(ex)}
 
 
 # @@@SNIPEND